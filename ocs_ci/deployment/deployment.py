@@ -48,7 +48,7 @@ from ocs_ci.ocs.resources.pod import (
 )
 from ocs_ci.ocs.uninstall import uninstall_ocs
 from ocs_ci.ocs.utils import setup_ceph_toolbox, collect_ocs_logs
-from ocs_ci.utility import templating, ibmcloud
+from ocs_ci.utility import templating, ibmcloud, kms
 from ocs_ci.utility.flexy import load_cluster_info
 from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import (
@@ -647,6 +647,8 @@ class Deployment(object):
             cluster_data["spec"]["encryption"] = {
                 "enable": True,
             }
+            if config.DEPLOYMENT.get("kms_deployment"):
+                kms.get_kms_deployment().deploy()
 
         cluster_data_yaml = tempfile.NamedTemporaryFile(
             mode="w+", prefix="cluster_storage", delete=False
@@ -58,6 +58,18 @@ TEMPLATE_DEPLOYMENT_CLO = os.path.join(
     TEMPLATE_DEPLOYMENT_LOGGING, "clusterlogging_operator"
 )
 TEMPLATE_AUTHENTICATION_DIR = os.path.join(TEMPLATE_DIR, "authentication")
+TEMPLATE_DEPLOYMENT_VAULT_DIR = os.path.join(TEMPLATE_DEPLOYMENT_DIR, "vault")
+EXTERNAL_VAULT_CA_CERT = os.path.join(TEMPLATE_DEPLOYMENT_VAULT_DIR, "ca-cert.yaml")
+EXTERNAL_VAULT_CLIENT_CERT = os.path.join(
+    TEMPLATE_DEPLOYMENT_VAULT_DIR, "client-cert.yaml"
+)
+EXTERNAL_VAULT_CLIENT_KEY = os.path.join(
+    TEMPLATE_DEPLOYMENT_VAULT_DIR, "client-key.yaml"
+)
+EXTERNAL_VAULT_KMS_TOKEN = os.path.join(TEMPLATE_DEPLOYMENT_VAULT_DIR, "kms-token.yaml")
+EXTERNAL_VAULT_KMS_CONNECTION_DETAILS = os.path.join(
+    TEMPLATE_DEPLOYMENT_VAULT_DIR, "kms-connection-details.yaml"
+)
 DATA_DIR = os.path.join(TOP_DIR, "data")
 ROOK_REPO_DIR = os.path.join(DATA_DIR, "rook")
 ROOK_EXAMPLES_DIR = os.path.join(
@@ -264,6 +276,14 @@ CEPH_ROOK_IO_PVC_LABEL = "ceph.rook.io/pvc"
 PGSQL_APP_LABEL = "app=postgres"
 HOSTNAME_LABEL = "kubernetes.io/hostname"
 
+# Vault related constants
+VAULT_DEFAULT_NAMESPACE = ""
+VAULT_DEFAULT_PATH_PREFIX = "ocs"
+VAULT_DEFAULT_POLICY_PREFIX = "ocs"
+VAULT_DEFAULT_CA_CERT = "ocs-kms-ca-secret"
+VAULT_DEFAULT_CLIENT_CERT = "ocs-kms-client-cert"
+VAULT_DEFAULT_CLIENT_KEY = "ocs-kms-client-key"
+
 # Auth Yaml
 OCSCI_DATA_BUCKET = "ocs-ci-data"
 AUTHYAML = "auth.yaml"
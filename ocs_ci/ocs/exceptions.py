@@ -263,3 +263,15 @@ class UnhealthyBucket(Exception):
 
 class NotFoundError(Exception):
     pass
+
+
+class KMSNotSupported(Exception):
+    pass
+
+
+class VaultDeploymentError(Exception):
+    pass
+
+
+class VaultOperationError(Exception):
+    pass
@@ -0,0 +1,439 @@
+# -*- coding: utf8 -*-
+"""
+This module contains KMS related class and methods
+currently supported KMSs: Vault
+
+"""
+import base64
+import logging
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+
+import hvac
+import requests
+import yaml
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.exceptions import (
+    CommandFailed,
+    KMSNotSupported,
+    VaultDeploymentError,
+    VaultOperationError,
+)
+from ocs_ci.utility import templating
+from ocs_ci.utility.utils import (
+    get_running_cluster_id,
+    load_auth_config,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# The vault resource templates are static assets, so they are read and
+# parsed once at import time and deepcopied per use
+_TEMPLATES = {
+    "ca_cert": templating.load_yaml(constants.EXTERNAL_VAULT_CA_CERT),
+    "client_cert": templating.load_yaml(constants.EXTERNAL_VAULT_CLIENT_CERT),
+    "client_key": templating.load_yaml(constants.EXTERNAL_VAULT_CLIENT_KEY),
+    "token": templating.load_yaml(constants.EXTERNAL_VAULT_KMS_TOKEN),
+    "connection": templating.load_yaml(constants.EXTERNAL_VAULT_KMS_CONNECTION_DETAILS),
+}
+
+
+class KMS(object):
+    """
+    This is base class for various KMS deployments
+    """
+
+    def __init__(self, provider=None):
+        self.kms_provider = provider
+
+    def deploy(self):
+        raise NotImplementedError("Child class should implement this method")
+
+
+class Vault(KMS):
+    """
+    A class which handles deployment and other
+    configs related to vault
+
+    """
+
+    def __init__(self):
+        super().__init__("vault")
+        self.vault_server = None
+        self.port = None
+        self.cluster_id = None
+        # Name of kubernetes resources
+        # for ca_cert, client_cert, client_key
+        self.ca_cert_name = None
+        self.client_cert_name = None
+        self.client_key_name = None
+        self.vault_root_token = None
+        self.vault_namespace = None
+        self.vault_deploy_mode = config.ENV_DATA.get("vault_deploy_mode")
+        self.vault_backend_path = None
+        # During prereq we will store the policy name
+        # and the token generated for the policy here
+        self.vault_policy_name = None
+        self.vault_path_token = None
+        # vault configuration, hvac client and the CA cert file it
+        # verifies against are all built lazily on first use
+        self._vault_conf = None
+        self._hvac_client = None
+        self.ca_path = None
+
+    def deploy(self):
+        """
+        This function delegates the deployment of vault
+        based on OCP or vault standalone external mode deployment
+
+        Raises:
+            VaultDeploymentError: if the deployment mode is not supported
+
+        """
+        if self.vault_deploy_mode == "external":
+            self.deploy_vault_external()
+        else:
+            raise VaultDeploymentError("Not a supported vault deployment mode")
+
+    def deploy_vault_external(self):
+        """
+        This function takes care of deployment and configuration
+        for external mode vault deployment. We are assuming that
+        an external vault service already exists and we will be just
+        configuring the necessary OCP objects for OCS like secrets, token etc
+
+        """
+        self.vault_server = self.vault_conf["VAULT_ADDR"]
+        self.port = self.vault_conf["PORT"]
+        self.vault_root_token = self.vault_conf["VAULT_ROOT_TOKEN"]
+        self.vault_namespace = self.vault_conf.get(
+            "VAULT_NAMESPACE", constants.VAULT_DEFAULT_NAMESPACE
+        )
+        # The cert secrets only depend on the auth config, so apply
+        # them to the cluster while the vault side configuration is in
+        # flight; both phases are network bound and independent. The
+        # token and connection payloads need the prereq results so
+        # they go out in a second batch once it returns
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            prereq = executor.submit(self.vault_prereq)
+            try:
+                create_resources_batch(self._build_cert_payloads())
+            finally:
+                prereq.result()
+        create_resources_batch(
+            [self._build_token_payload(), self._build_connection_payload()]
+        )
+
+    @property
+    def vault_conf(self):
+        """
+        The vault section of the auth config, loaded lazily on first
+        access so the yaml file is read and parsed only once
+
+        Returns:
+            dict: vault configuration
+
+        """
+        if self._vault_conf is None:
+            self._vault_conf = load_auth_config()["vault"]
+        return self._vault_conf
+
+    @property
+    def hvac_client(self):
+        """
+        A lazily built vault API client, reused by all the vault
+        operations so that we keep a single connection to the server
+        instead of forking a vault CLI per call
+
+        Returns:
+            hvac.Client: authenticated vault API client
+
+        """
+        if not self._hvac_client:
+            verify = False
+            if self.vault_conf.get("VAULT_CACERT_BASE64"):
+                ca_cert = tempfile.NamedTemporaryFile(
+                    mode="wb", prefix="vault-ca", suffix=".crt", delete=False
+                )
+                ca_cert.write(base64.b64decode(self.vault_conf["VAULT_CACERT_BASE64"]))
+                ca_cert.close()
+                self.ca_path = ca_cert.name
+                verify = self.ca_path
+            # One session with a keepalive pool makes every vault REST
+            # call reuse the same TCP+TLS connection instead of paying
+            # a fresh handshake per request
+            session = requests.Session()
+            session.verify = verify
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            session.mount("https://", adapter)
+            self._hvac_client = hvac.Client(
+                url=f"https://{self.vault_server}:{self.port}",
+                token=self.vault_root_token,
+                verify=verify,
+                session=session,
+            )
+        return self._hvac_client
+
+    def vault_prereq(self):
+        """
+        Configure the backend path, policy and token on the
+        vault server which OCS will use
+
+        """
+        self.vault_unseal()
+        self.vault_create_backend_path()
+        self.vault_create_policy()
+        self.vault_path_token = self.generate_vault_token()
+
+    def vault_unseal(self):
+        """
+        Unseal vault if sealed
+
+        Raises:
+            VaultOperationError: In case unseal operation failed
+
+        """
+        if self.vault_sealed():
+            logger.info("Vault is sealed, Unsealing now..")
+            unseal_keys = [self.vault_conf[f"UNSEAL_KEY{i + 1}"] for i in range(3)]
+            # The key submissions are independent of each other so
+            # issue them concurrently instead of waiting one RTT each
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                list(executor.map(self._vault_unseal, unseal_keys))
+            # Check if vault is unsealed or not
+            if self.vault_sealed():
+                raise VaultOperationError("Failed to Unseal vault")
+            else:
+                logger.info("Vault has been successfully unsealed")
+        else:
+            logger.info("Vault is not sealed")
+
+    def _vault_unseal(self, key):
+        """
+        Submit a single unseal key to the vault server
+
+        Args:
+            key (str): unseal key
+
+        """
+        self.hvac_client.sys.submit_unseal_key(key)
+
+    def vault_sealed(self):
+        """
+        Check the seal status of the vault server
+
+        Returns:
+            bool: True if vault is sealed, False otherwise
+
+        """
+        return self.hvac_client.sys.read_seal_status()["sealed"]
+
+    def vault_create_backend_path(self):
+        """
+        Create a vault backend path to be used by OCS
+
+        Raises:
+            VaultOperationError: If the path creation fails
+
+        """
+        if config.ENV_DATA.get("VAULT_BACKEND_PATH"):
+            self.vault_backend_path = config.ENV_DATA["VAULT_BACKEND_PATH"]
+        else:
+            # Generate backend path name using prefix "ocs"
+            # "ocs-<cluster-id>"
+            self.cluster_id = get_running_cluster_id()
+            self.vault_backend_path = (
+                f"{constants.VAULT_DEFAULT_PATH_PREFIX}-{self.cluster_id}"
+            )
+        try:
+            self.hvac_client.sys.enable_secrets_engine(
+                backend_type="kv", path=self.vault_backend_path
+            )
+        except hvac.exceptions.VaultError as err:
+            raise VaultOperationError(
+                f"Failed to create path {self.vault_backend_path}, error: {err}"
+            )
+        logger.info(f"vault path {self.vault_backend_path} created")
+
+    def vault_create_policy(self):
+        """
+        Create a vault policy restricted to the OCS backend path
+
+        Raises:
+            VaultOperationError: If the policy creation fails
+
+        """
+        policy = (
+            f'path "{self.vault_backend_path}/*" {{\n'
+            f'  capabilities = ["create", "read", "update", "delete"]\n'
+            f"}}"
+        )
+        if not self.cluster_id:
+            self.cluster_id = get_running_cluster_id()
+        self.vault_policy_name = (
+            f"{constants.VAULT_DEFAULT_POLICY_PREFIX}-{self.cluster_id}"
+        )
+        try:
+            self.hvac_client.sys.create_or_update_policy(
+                name=self.vault_policy_name, policy=policy
+            )
+        except hvac.exceptions.VaultError as err:
+            raise VaultOperationError(
+                f"Failed to create policy {self.vault_policy_name}, error: {err}"
+            )
+        logger.info(f"vault policy {self.vault_policy_name} created")
+
+    def generate_vault_token(self):
+        """
+        Generate a token for self.vault_policy_name
+
+        Returns:
+            str: vault token
+
+        """
+        out = self.hvac_client.create_token(policies=[self.vault_policy_name])
+        return out["auth"]["client_token"]
+
+    def _build_cert_payloads(self):
+        """
+        Build the secret payloads for the ca cert, client cert and
+        client key, these depend only on the auth config
+
+        Returns:
+            list: yaml dictionaries for the cert secrets
+
+        """
+        ca_data = deepcopy(_TEMPLATES["ca_cert"])
+        self.ca_cert_name = constants.VAULT_DEFAULT_CA_CERT
+        ca_data["metadata"]["name"] = self.ca_cert_name
+        ca_data["data"]["cert"] = self.vault_conf["VAULT_CACERT_BASE64"]
+
+        client_cert_data = deepcopy(_TEMPLATES["client_cert"])
+        self.client_cert_name = constants.VAULT_DEFAULT_CLIENT_CERT
+        client_cert_data["metadata"]["name"] = self.client_cert_name
+        client_cert_data["data"]["cert"] = self.vault_conf["VAULT_CLIENT_CERT_BASE64"]
+
+        client_key_data = deepcopy(_TEMPLATES["client_key"])
+        self.client_key_name = constants.VAULT_DEFAULT_CLIENT_KEY
+        client_key_data["metadata"]["name"] = self.client_key_name
+        client_key_data["data"]["cert"] = self.vault_conf["VAULT_CLIENT_KEY_BASE64"]
+
+        return [ca_data, client_cert_data, client_key_data]
+
+    def _build_token_payload(self):
+        """
+        Build the secret payload carrying the vault token generated
+        for the OCS policy
+
+        Returns:
+            dict: yaml dictionary for the token secret
+
+        """
+        token_data = deepcopy(_TEMPLATES["token"])
+        token_data["data"]["token"] = base64.b64encode(
+            self.vault_path_token.encode("ascii")
+        ).decode("ascii")
+        return token_data
+
+    def _build_connection_payload(self):
+        """
+        Build the ConfigMap payload with the vault connection details
+
+        Returns:
+            dict: yaml dictionary for the connection ConfigMap
+
+        """
+        connection_data = deepcopy(_TEMPLATES["connection"])
+        vault_addr = f"https://{self.vault_server}:{self.port}"
+        connection_data["data"]["VAULT_ADDR"] = vault_addr
+        connection_data["data"]["VAULT_BACKEND_PATH"] = self.vault_backend_path
+        connection_data["data"]["VAULT_CACERT"] = self.ca_cert_name
+        connection_data["data"]["VAULT_CLIENT_CERT"] = self.client_cert_name
+        connection_data["data"]["VAULT_CLIENT_KEY"] = self.client_key_name
+        connection_data["data"]["VAULT_NAMESPACE"] = self.vault_namespace
+        return connection_data
+
+
+def create_resource(resource_data):
+    """
+    Given a dictionary of resource data, this function will
+    create the oc resource. The yaml is streamed to oc through
+    stdin so no temporary file is left behind in /tmp
+
+    Args:
+        resource_data (dict): yaml dictionary for resource
+
+    Raises:
+        CommandFailed: In case the oc command fails
+
+    """
+    logger.info(f"Creating resource {resource_data['metadata']['name']}")
+    try:
+        subprocess.run(
+            ["oc", "create", "-f", "-"],
+            input=yaml.safe_dump(resource_data),
+            text=True,
+            capture_output=True,
+            timeout=1200,
+            check=True,
+        )
+    except subprocess.CalledProcessError as err:
+        raise CommandFailed(
+            f"Error during creation of resource.\nError is {err.stderr}"
+        )
+
+
+def create_resources_batch(resources):
+    """
+    Create a list of oc resources through a single ``oc apply`` call
+    instead of one process per resource
+
+    Args:
+        resources (list): list of yaml dictionaries for resources
+
+    Raises:
+        CommandFailed: In case the oc command fails
+
+    """
+    buf = "\n---\n".join(yaml.safe_dump(resource) for resource in resources)
+    logger.info(f"Creating a batch of {len(resources)} resources")
+    try:
+        subprocess.run(
+            ["oc", "apply", "-f", "-"],
+            input=buf,
+            text=True,
+            capture_output=True,
+            timeout=1200,
+            check=True,
+        )
+    except subprocess.CalledProcessError as err:
+        raise CommandFailed(
+            f"Error during creation of resources batch.\nError is {err.stderr}"
+        )
+
+
+kms_map = {"vault": Vault}
+
+
+def get_kms_deployment():
+    """
+    Get the KMS deployment object based on the provider
+    present in ENV_DATA
+
+    Returns:
+        KMS: an object of the respective KMS deployment class
+
+    Raises:
+        KMSNotSupported: If the KMS provider is not supported
+
+    """
+    provider = config.ENV_DATA.get("KMS_PROVIDER", "vault")
+    try:
+        return kms_map[provider]()
+    except KeyError:
+        raise KMSNotSupported(f"KMS provider {provider} is not supported")
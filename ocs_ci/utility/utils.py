@@ -13,6 +13,7 @@ import time
 import traceback
 import stat
 from copy import deepcopy
+from functools import lru_cache
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from scipy.stats import tmean, scoreatpercentile
@@ -3056,6 +3057,27 @@ def get_cluster_id(cluster_path):
     return metadata["clusterID"]
 
 
+@lru_cache(maxsize=1)
+def get_running_cluster_id():
+    """
+    Get cluster UUID
+    Not relying on metadata.json as user sometimes want to run
+    only with kubeconfig for some tests. For this function to work
+    cluster has to be in running state
+
+    The cluster UUID is immutable for the life of the process, so the
+    result is cached and the oc call is paid only once
+
+    Returns:
+        str: cluster UUID
+
+    """
+    cluster_id = run_cmd(
+        "oc get clusterversion version -o jsonpath='{.spec.clusterID}'"
+    )
+    return cluster_id
+
+
 def get_ocp_upgrade_history():
     """
     Gets the OCP upgrade history for the cluster
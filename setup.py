@@ -43,6 +43,7 @@ setup(
         "pytest-ordering==0.6",
         "funcy==1.14",
         "semantic-version==2.8.5",
+        "hvac==0.10.6",
         "jsonschema>=3.2.0",
         "google-cloud-storage==1.29.0",
         "elasticsearch==7.8.0",